@@ -1,23 +1,22 @@
 import argparse
-import os
 import sys
+import time
 import pprint
 
 from reports import utils
 from constants import ReportConstants
 
 
-def get_asset_report_dict(asset_tasks, prod_assets):
+def iter_asset_report_rows(asset_tasks, prod_assets):
     """
 
     Args:
         asset_tasks(list of dict): List of shotgun task entity dictionaries
         prod_assets(set): set containing production asset names.
 
-    Returns:
+    Yields: Asset report dictionaries formatted for writing, one per task.
 
     """
-    csv_tasks = []
     for task in asset_tasks:
         task_dict = {                                                                   # Example:
             ReportConstants.id: str(task["id"]),                                        # "ID": "1234"
@@ -35,9 +34,7 @@ def get_asset_report_dict(asset_tasks, prod_assets):
                 ", ".join(tag["name"] for tag in task["tags"])
             ),
         }
-        csv_tasks.append(task_dict)
-
-    return csv_tasks
+        yield task_dict
 
 
 def get_production_assets_from_shots(prod_shots, all_tasks):
@@ -120,22 +117,32 @@ def get_asset_tasks(sg, sg_project):
     return sg.find("Task", filter_, ReportConstants.asset_task_fields)
 
 
-def asset_run(args, logger):
+def asset_run(args, logger, timings=None):
     """
 
     Args:
         args: parser arguments
         logger: python logging logger object
+        timings(dict): If given, filled with the duration in seconds of the "filter" and "write" stages.
 
-    Returns: True if csv is written to the given location.
+    Returns: True if the report is written to every given output.
              False if not
 
     """
     logger.info("Starting Asset Report generation.")
 
+    # Checking the output formats and destinations before fetching anything from shotgun.
+    paths = utils.get_output_paths(args)
+    utils.validate_output_paths(paths)
+
     # Getting shotgun connection and shotgun project entity
     project_id = args.project_id
-    sg = utils.get_sg_connection()
+    sg = utils.get_sg_connection(
+        record=args.record,
+        replay=args.replay,
+        anonymize=args.anonymize,
+        replay_latency=args.replay_latency or "recorded",
+    )
     sg_project = utils.get_sg_project_from_id(sg, project_id)
 
     # If tool can't find a shotgun project from the given ID, exit
@@ -152,22 +159,25 @@ def asset_run(args, logger):
     # Filtering list down to production assets
     # If asset is linked to a production shot, it is a production asset.
     prod_shots = get_production_shots(sg, sg_project)
+    start = time.perf_counter()
     prod_assets = get_production_assets_from_shots(prod_shots, asset_tasks)
+    filter_duration = time.perf_counter() - start
     logger.debug("Got {} production assets.".format(len(prod_assets)))
+    logger.info("Filtered production assets in {:.3f}s.".format(filter_duration))
 
     # Processing tasks into final report format.
-    logger.info("Compiling report.")
-    report_dict = get_asset_report_dict(asset_tasks, prod_assets)
-
-    logger.info("Writing report to csv")
-    # csv will error if the path doesn't exist.
-    dir_ = os.path.dirname(args.path)
-    if not os.path.exists(dir_):
-        logger.debug("Creating directory: \n{}".format(dir_))
-        os.mkdir(dir_)
-
-    # Writing out csv of report dictionary.
-    utils.write_csv(args.path, ReportConstants.asset_csv_header_order, report_dict)
+    # Rows are built lazily and handed to every output writer in a single pass.
+    logger.info("Compiling report and writing to {} output(s).".format(len(paths)))
+    report_rows = iter_asset_report_rows(asset_tasks, prod_assets)
+    start = time.perf_counter()
+    row_count = utils.write_reports(paths, ReportConstants.asset_csv_header_order, report_rows, logger)
+    write_duration = time.perf_counter() - start
+    logger.debug("Wrote {} rows.".format(row_count))
+    logger.info("Compiled and wrote report in {:.3f}s.".format(write_duration))
+
+    if timings is not None:
+        timings["filter"] = filter_duration
+        timings["write"] = write_duration
     return True
 
 
@@ -179,7 +189,7 @@ def get_parser():
     """
     parser = argparse.ArgumentParser(
         prog="asset_report",
-        description="Generate a csv report for Shotgun Asset tasks.",
+        description="Generate a csv, jsonl or xlsx report for Shotgun Asset tasks.",
     )
     parser.add_argument(
         "path",
@@ -191,6 +201,15 @@ def get_parser():
         type=int,
         help="Enter the Shotgun id for the project entity you want to generate a report for."
     )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        action="append",
+        help="Additional path to write the report to. Can be given multiple times. "
+             "The extension picks the format: .csv, .jsonl or .xlsx",
+    )
+    utils.add_connection_arguments(parser)
     return parser
 
 
@@ -200,6 +219,7 @@ def main():
     logger = logger_shot
     parser = get_parser()
     args = parser.parse_args()
+    utils.check_connection_arguments(parser, args)
 
     try:
         success = asset_run(args, logger)
@@ -210,9 +230,9 @@ def main():
         return 1
     else:
         if not success:
-            logger.info("Unable to create Asset report csv.")
+            logger.info("Unable to create Asset report.")
         else:
-            logger.info("Asset report successfully generated: \n{}".format(args.path))
+            logger.info("Asset report successfully generated: \n{}".format("\n".join(utils.get_output_paths(args))))
         return 0
 
 
@@ -0,0 +1,186 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+
+
+# Entity fields whose string values are replaced when anonymizing an archive.
+# Status lists, dates, ids and entity types are kept as is, the report logic depends on them.
+ANONYMIZED_FIELDS = ("name", "code", "content")
+
+REPLAY_LATENCIES = ("recorded", "zero")
+
+
+def _request_key(entity_type, filters, fields, kwargs):
+    """
+
+    Args:
+        entity_type(str): Shotgun entity type. Eg. "Task"
+        filters(list): Shotgun filter list
+        fields(list): Shotgun return fields
+        kwargs(dict): Any other keyword arguments given to find/find_one
+
+    Returns: Stable string key for the given request.
+
+    """
+    return json.dumps([entity_type, filters, fields or [], kwargs], sort_keys=True, default=str)
+
+
+class Anonymizer(object):
+    """
+    Replaces names in Shotgun data with stable hashed values.
+
+    The same value always maps to the same replacement, so links between entities
+    (shot names on tasks, asset names on shots, project in filters) are kept intact.
+    A random salt is generated for each Anonymizer and never stored, so names can't be
+    recovered from an archive by hashing likely names.
+    """
+
+    # Long enough that distinct names on a large show don't collide and merge in the report.
+    digest_length = 16
+
+    def __init__(self):
+        self.salt = os.urandom(16).hex()
+
+    def anonymize_value(self, value):
+        """
+
+        Args:
+            value(str): Value to anonymize
+
+        Returns: Hashed replacement value. Eg. "anon_1a2b3c4d5e6f7a8b"
+
+        """
+        digest = hashlib.sha1((self.salt + value).encode("utf-8")).hexdigest()
+        return "anon_{}".format(digest[:self.digest_length])
+
+    def anonymize(self, data, key=None):
+        """
+
+        Args:
+            data: Shotgun request or response data. Dicts, lists and plain values.
+            key(str): Field name the given data is stored under, if any.
+
+        Returns: Copy of the given data with names replaced.
+
+        """
+        if isinstance(data, dict):
+            return {k: self.anonymize(v, k) for k, v in data.items()}
+        if isinstance(data, (list, tuple)):
+            return [self.anonymize(v, key) for v in data]
+        if isinstance(data, str) and key and key.split(".")[-1] in ANONYMIZED_FIELDS:
+            return self.anonymize_value(data)
+        return data
+
+    def anonymize_filters(self, filters):
+        """
+
+        Args:
+            filters(list): Shotgun filter list. Eg. [["code", "is", "sh010"], ["project", "is", {...}]]
+
+        Returns: Copy of the given filters with names replaced.
+                 Values of [field, operator, value] filters on a name field are replaced as well as
+                 names inside entity dictionaries. Nested filter groups are handled recursively.
+
+        """
+        anon_filters = []
+        for filter_ in filters:
+            if isinstance(filter_, dict) and "filters" in filter_:
+                # Filter group. Eg. {"filter_operator": "any", "filters": [...]}
+                group = dict(filter_)
+                group["filters"] = self.anonymize_filters(filter_["filters"])
+                anon_filters.append(group)
+            elif isinstance(filter_, (list, tuple)) and len(filter_) >= 3 and isinstance(filter_[0], str):
+                field, operator, values = filter_[0], filter_[1], filter_[2:]
+                anon_filters.append([field, operator] + [self.anonymize(value, field) for value in values])
+            else:
+                anon_filters.append(self.anonymize(filter_))
+        return anon_filters
+
+
+class RecordingShotgun(object):
+    """
+    Wraps a Shotgun_api3 Shotgun object, recording every find/find_one call to an archive.
+
+    The archive is gzipped JSON lines, one line per request with its response and latency.
+    Each call is appended as it happens, so the archive is usable even if the report fails.
+    """
+
+    def __init__(self, sg, path, anonymize=False):
+        self.sg = sg
+        self.path = path
+        self.anonymizer = Anonymizer() if anonymize else None
+
+        # Starting a fresh archive for this run.
+        with gzip.open(self.path, "wt"):
+            pass
+
+    def _record(self, method, entity_type, filters, fields, kwargs, response, latency):
+        # The caller always gets the real response, only the archived copy is anonymized.
+        recorded = response
+        if self.anonymizer:
+            filters = self.anonymizer.anonymize_filters(filters)
+            recorded = self.anonymizer.anonymize(response)
+
+        record = {
+            "method": method,
+            "key": _request_key(entity_type, filters, fields, kwargs),
+            "latency": latency,
+            "response": recorded,
+        }
+        with gzip.open(self.path, "at") as archive:
+            archive.write(json.dumps(record, separators=(",", ":"), default=str))
+            archive.write("\n")
+        return response
+
+    def find(self, entity_type, filters, fields=None, **kwargs):
+        start = time.perf_counter()
+        response = self.sg.find(entity_type, filters, fields, **kwargs)
+        latency = time.perf_counter() - start
+        return self._record("find", entity_type, filters, fields, kwargs, response, latency)
+
+    def find_one(self, entity_type, filters, fields=None, **kwargs):
+        start = time.perf_counter()
+        response = self.sg.find_one(entity_type, filters, fields, **kwargs)
+        latency = time.perf_counter() - start
+        return self._record("find_one", entity_type, filters, fields, kwargs, response, latency)
+
+
+class ReplayShotgun(object):
+    """
+    Serves find/find_one calls offline from an archive written by RecordingShotgun.
+
+    Responses are returned with the recorded latency, or with none at all when
+    latency is "zero", so only the filtering and writing stages are being timed.
+    """
+
+    def __init__(self, path, latency="recorded"):
+        if latency not in REPLAY_LATENCIES:
+            raise ValueError("Unknown replay latency: {}. Expected one of {}".format(latency, REPLAY_LATENCIES))
+        self.path = path
+        self.latency = latency
+
+        self.records = {}
+        with gzip.open(self.path, "rt") as archive:
+            for line in archive:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                self.records[(record["method"], record["key"])] = record
+
+    def _replay(self, method, entity_type, filters, fields, kwargs):
+        key = _request_key(entity_type, filters, fields, kwargs)
+        record = self.records.get((method, key))
+        if record is None:
+            raise KeyError("No recorded response in {} for {} request: \n{}".format(self.path, method, key))
+
+        if self.latency == "recorded":
+            time.sleep(record["latency"])
+        return record["response"]
+
+    def find(self, entity_type, filters, fields=None, **kwargs):
+        return self._replay("find", entity_type, filters, fields, kwargs)
+
+    def find_one(self, entity_type, filters, fields=None, **kwargs):
+        return self._replay("find_one", entity_type, filters, fields, kwargs)
@@ -0,0 +1,167 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+from reports import shot_report
+from reports import asset_report
+from reports import utils
+
+
+# Report run function for each report type that can be benchmarked.
+REPORT_RUNS = {
+    "shot": shot_report.shot_run,
+    "asset": asset_report.asset_run,
+}
+
+
+def bench(report, archive, project_id, paths, repeat, logger):
+    """
+    Replays a recorded archive with zero latency through the given report, timing its stages.
+
+    Args:
+        report(str): Report type to run. Eg. "shot", "asset"
+        archive(str): Path of an archive recorded with --record.
+        project_id(int): Shotgun project entity ID the archive was recorded for.
+        paths(list of str): Report output paths to write to on every run.
+        repeat(int): Number of times to run the report.
+        logger: python logging logger object
+
+    Returns: Dictionary of the fastest duration in seconds of each stage. Eg. {"filter": 0.012, "write": 0.34}
+
+    """
+    args = argparse.Namespace(
+        path=paths[0],
+        output=paths[1:],
+        project_id=project_id,
+        record=None,
+        replay=archive,
+        anonymize=False,
+        replay_latency="zero",
+    )
+
+    best = {}
+    for _ in range(repeat):
+        timings = {}
+        if not REPORT_RUNS[report](args, logger, timings):
+            raise ValueError("Could not find project {} in archive {}".format(project_id, archive))
+        for stage, duration in timings.items():
+            best[stage] = min(duration, best.get(stage, duration))
+    return best
+
+
+def compare_to_baseline(timings, baseline, tolerance):
+    """
+
+    Args:
+        timings(dict): Stage durations from bench.
+        baseline(dict): Stage durations from a previous bench run.
+        tolerance(float): Allowed slow down before a stage counts as a regression. Eg. 0.1 for 10%
+
+    Returns: List of stages that are slower than their baseline by more than the tolerance.
+
+    """
+    regressions = []
+    for stage, duration in sorted(timings.items()):
+        if stage in baseline and duration > baseline[stage] * (1 + tolerance):
+            regressions.append(stage)
+    return regressions
+
+
+def get_parser():
+    """
+
+    Returns: Replay benchmark argument parser
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="replay_bench",
+        description="Time the filtering and writing stages of a report by replaying a recorded archive.",
+    )
+    parser.add_argument(
+        "report",
+        choices=sorted(REPORT_RUNS),
+        help="Report type to benchmark.",
+    )
+    parser.add_argument(
+        "archive",
+        type=str,
+        help="Archive recorded with --record to replay.",
+    )
+    parser.add_argument(
+        "project_id",
+        type=int,
+        help="Shotgun id of the project entity the archive was recorded for.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        action="append",
+        help="Path to write the report to on every run. Can be given multiple times. "
+             "Defaults to a csv in a temporary directory.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Number of runs. The fastest duration of each stage is reported.",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        help="Baseline json to compare against. Exits with 1 if a stage regressed.",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        type=str,
+        help="Save the measured durations as a baseline json to the given path.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="Allowed slow down against the baseline before failing. Eg. 0.1 for 10%%",
+    )
+    return parser
+
+
+def main():
+    """
+
+    Returns: Logs the stage durations. 1 if any stage regressed against the baseline, else 0.
+
+    """
+    logger_main, logger_shot, logger_asset = utils.get_logger()
+    parser = get_parser()
+    args = parser.parse_args()
+    logger = logger_asset if args.report == "asset" else logger_shot
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = args.output or [os.path.join(tmp_dir, "{}_report.csv".format(args.report))]
+        timings = bench(args.report, args.archive, args.project_id, paths, args.repeat, logger)
+
+    for stage, duration in sorted(timings.items()):
+        logger_main.info("{}: {:.6f}s".format(stage, duration))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(timings, f, indent=4, sort_keys=True)
+        logger_main.info("Baseline saved to: \n{}".format(args.save_baseline))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(timings, baseline, args.tolerance)
+        for stage in regressions:
+            logger_main.warning("{} regressed: {:.6f}s against baseline {:.6f}s".format(
+                stage, timings[stage], baseline[stage]
+            ))
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
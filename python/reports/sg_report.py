@@ -25,7 +25,7 @@ def get_parser():
     parser_shot = subparsers.add_parser(
         "shot",
         prog="shot_report",
-        description="Generate a csv reports for Shotgun Shot Tasks",
+        description="Generate a csv, jsonl or xlsx report for Shotgun Shot Tasks",
         add_help=False,
         parents=[shot_report.get_parser()],
     )
@@ -33,7 +33,7 @@ def get_parser():
     parser_asset = subparsers.add_parser(
         "asset",
         prog="asset_report",
-        description="Generate a csv reports for Shotgun Asset Tasks",
+        description="Generate a csv, jsonl or xlsx report for Shotgun Asset Tasks",
         add_help=False,
         parents=[asset_report.get_parser()],
 
@@ -46,12 +46,13 @@ def get_parser():
 def main():
     """
 
-    Returns: Runs report chosen in args, writes report csv to given location.
+    Returns: Runs report chosen in args, writes the report to every given output.
 
     """
     logger_main, logger_shot, logger_asset = utils.get_logger()
     parser = get_parser()
     args = parser.parse_args()
+    utils.check_connection_arguments(parser, args)
 
     logger_main.info("Project id: {}".format(args.project_id))
     func_name = args.func.__name__
@@ -69,7 +70,7 @@ def main():
         )
         return 1
     else:
-        logger_main.info("report generated to: \n{}".format(args.path))
+        logger_main.info("report generated to: \n{}".format("\n".join(utils.get_output_paths(args))))
         return 0
 
 
@@ -1,23 +1,21 @@
 import argparse
-import os
 import sys
+import time
 
 from reports import utils
 from constants import ReportConstants
 
 
-def get_shot_report_dict(all_tasks, prod_shots):
+def iter_shot_report_rows(all_tasks, prod_shots):
     """
 
     Args:
         all_tasks(list of dict): List of shotgun task entity dictionaries
         prod_shots(set): set containing production shot names.
 
-    Returns: List of shot report dictionaries formatted for writing to csv.
+    Yields: Shot report dictionaries formatted for writing, one per task.
 
     """
-    # If the logic is simpler, this can be done as a list comprehension.
-    csv_tasks = []
     for task in all_tasks:
         task_dict = {                                                               # Example:
             ReportConstants.id: str(task["id"]),                                    # "ID": "1234"
@@ -35,8 +33,7 @@ def get_shot_report_dict(all_tasks, prod_shots):
                 ", ".join(tag["name"] for tag in task["tags"])
             ),
         }
-        csv_tasks.append(task_dict)
-    return csv_tasks
+        yield task_dict
 
 
 def get_production_shots_from_tasks(all_tasks):
@@ -87,22 +84,32 @@ def get_shot_tasks(sg, sg_project):
     return sg.find("Task", filter_, ReportConstants.shot_task_fields)
 
 
-def shot_run(args, logger):
+def shot_run(args, logger, timings=None):
     """
 
     Args:
         args: parser arguments
         logger: python logging logger object
+        timings(dict): If given, filled with the duration in seconds of the "filter" and "write" stages.
 
-    Returns: True if csv is written to the given location.
+    Returns: True if the report is written to every given output.
              False if not
 
     """
     logger.info("Starting Shot Report generation.")
 
+    # Checking the output formats and destinations before fetching anything from shotgun.
+    paths = utils.get_output_paths(args)
+    utils.validate_output_paths(paths)
+
     # Getting shotgun connection and shotgun project entity
     project_id = args.project_id
-    sg = utils.get_sg_connection()
+    sg = utils.get_sg_connection(
+        record=args.record,
+        replay=args.replay,
+        anonymize=args.anonymize,
+        replay_latency=args.replay_latency or "recorded",
+    )
     sg_project = utils.get_sg_project_from_id(sg, project_id)
 
     # If tool can't find a shotgun project from the given ID, exit
@@ -118,8 +125,11 @@ def shot_run(args, logger):
 
     # Filtering shots to a list of Production shots
     # This is so we can mark if a shot is a Production Shot or not in the final report.
+    start = time.perf_counter()
     prod_shots = get_production_shots_from_tasks(shot_tasks)
+    filter_duration = time.perf_counter() - start
     logger.debug("Got {} production shots.".format(len(prod_shots)))
+    logger.info("Filtered production shots in {:.3f}s.".format(filter_duration))
 
     # Converting to a set of only the production shot names.
     # prod_shots = [task["entity"].get("name") for task in prod_shots]
@@ -127,18 +137,18 @@ def shot_run(args, logger):
     # logger.debug("Got {} production shots.".format(len(prod_shots)))
 
     # Processing tasks into final report format.
-    logger.info("Compiling report")
-    report_dict = get_shot_report_dict(shot_tasks, prod_shots)
-
-    logger.info("Writing report to csv")
-    # csv will error if the path doesn't exist.
-    dir_ = os.path.dirname(args.path)
-    if not os.path.exists(dir_):
-        logger.debug("Creating directory: \n{}".format(dir_))
-        os.mkdir(dir_)
-
-    # Writing out csv of report dictionary.
-    utils.write_csv(args.path, ReportConstants.shot_csv_header_order, report_dict)
+    # Rows are built lazily and handed to every output writer in a single pass.
+    logger.info("Compiling report and writing to {} output(s).".format(len(paths)))
+    report_rows = iter_shot_report_rows(shot_tasks, prod_shots)
+    start = time.perf_counter()
+    row_count = utils.write_reports(paths, ReportConstants.shot_csv_header_order, report_rows, logger)
+    write_duration = time.perf_counter() - start
+    logger.debug("Wrote {} rows.".format(row_count))
+    logger.info("Compiled and wrote report in {:.3f}s.".format(write_duration))
+
+    if timings is not None:
+        timings["filter"] = filter_duration
+        timings["write"] = write_duration
     return True
 
 
@@ -150,7 +160,7 @@ def get_parser():
     """
     parser = argparse.ArgumentParser(
         prog="shot_report",
-        description="Generate a csv report for Shotgun Shot tasks.",
+        description="Generate a csv, jsonl or xlsx report for Shotgun Shot tasks.",
     )
     parser.add_argument(
         "path",
@@ -162,6 +172,15 @@ def get_parser():
         type=int,
         help="Enter the Shotgun id for the project entity you want to generate a report for."
     )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        action="append",
+        help="Additional path to write the report to. Can be given multiple times. "
+             "The extension picks the format: .csv, .jsonl or .xlsx",
+    )
+    utils.add_connection_arguments(parser)
     return parser
 
 
@@ -171,6 +190,7 @@ def main():
     logger = logger_shot
     parser = get_parser()
     args = parser.parse_args()
+    utils.check_connection_arguments(parser, args)
 
     try:
         success = shot_run(args, logger)
@@ -181,9 +201,9 @@ def main():
         return 1
     else:
         if not success:
-            logger.info("Unable to create Shot report csv.")
+            logger.info("Unable to create Shot report.")
         else:
-            logger.info("Shot report successfully generated: \n{}".format(args.path))
+            logger.info("Shot report successfully generated: \n{}".format("\n".join(utils.get_output_paths(args))))
         return 0
 
 
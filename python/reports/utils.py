@@ -1,8 +1,10 @@
-import shotgun_api3
 import logging
+import json
 import csv
+import os
 
 from constants import ReportConstants
+from reports import recording
 
 
 def get_logger():
@@ -40,20 +42,85 @@ def get_logger():
     return logger_main, logger_shot, logger_asset
 
 
-def get_sg_connection():
+def get_sg_connection(record=None, replay=None, anonymize=False, replay_latency=None):
     """
 
-    Returns: Shotgun_api3 Shotgun object
+    Args:
+        record(str): If given, path to record all find/find_one requests and responses to.
+        replay(str): If given, path of a recorded archive to serve requests from instead of Shotgun.
+        anonymize(bool): Anonymize names in the recorded archive.
+        replay_latency(str): "recorded" to replay with the recorded latency, "zero" for none. Defaults to "recorded".
+
+    Returns: Shotgun_api3 Shotgun object, or a recording/replaying stand in for one.
 
     """
+    if replay:
+        return recording.ReplayShotgun(replay, latency=replay_latency or "recorded")
+
+    # Imported here so replaying an archive works offline without shotgun_api3 installed.
+    import shotgun_api3
+
     sg = shotgun_api3.Shotgun(
         base_url=ReportConstants.shotgun_url,       # Website url. Eg. "https://dreamworks.shotgunstudio.com"
         script_name=ReportConstants.login,          # Scrip user
         api_key=ReportConstants.password,           # Script key
     )
+    if record:
+        return recording.RecordingShotgun(sg, record, anonymize=anonymize)
     return sg
 
 
+def add_connection_arguments(parser):
+    """
+    Adds the Shotgun record/replay arguments to the given parser.
+
+    Args:
+        parser: argparse ArgumentParser
+
+    Returns: The given parser
+
+    """
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--record",
+        type=str,
+        metavar="ARCHIVE",
+        help="Record all Shotgun requests and responses of this run to the given archive path.",
+    )
+    group.add_argument(
+        "--replay",
+        type=str,
+        metavar="ARCHIVE",
+        help="Serve all Shotgun requests from the given recorded archive instead of Shotgun.",
+    )
+    parser.add_argument(
+        "--anonymize",
+        action="store_true",
+        help="Anonymize names in the recorded archive. Requires --record.",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        choices=recording.REPLAY_LATENCIES,
+        help="Replay responses with their recorded latency (default), or with zero latency. Requires --replay.",
+    )
+    return parser
+
+
+def check_connection_arguments(parser, args):
+    """
+    Exits with a usage error if a record/replay option is given without the mode it applies to.
+
+    Args:
+        parser: argparse ArgumentParser the given args were parsed with
+        args: parser arguments
+
+    """
+    if args.anonymize and not args.record:
+        parser.error("--anonymize requires --record.")
+    if args.replay_latency and not args.replay:
+        parser.error("--replay-latency requires --replay.")
+
+
 def get_sg_project_from_id(sg, project_id):
     """
     Gets shotgun project entity from the given entity ID.
@@ -90,18 +157,146 @@ def get_shot_tasks(sg, sg_project):
     return sg.find("Task", filter_, ReportConstants.shot_task_fields)
 
 
-def write_csv(path, field_template, csv_dict):
+class CsvReportWriter(object):
+    """Writes report rows to a csv file, one row at a time."""
+
+    def __init__(self, path, field_template):
+        self.file = open(path, "w")
+        self.writer = csv.DictWriter(self.file, lineterminator="\n", fieldnames=field_template)
+        self.writer.writeheader()
+
+    def write_row(self, row):
+        self.writer.writerow(row)
+
+    def close(self):
+        self.file.close()
+
+
+class JsonlReportWriter(object):
+    """Writes report rows to a JSON Lines file, one json object per row in field template order."""
+
+    def __init__(self, path, field_template):
+        self.file = open(path, "w")
+        self.field_template = field_template
+
+    def write_row(self, row):
+        self.file.write(json.dumps({field: row.get(field) for field in self.field_template}))
+        self.file.write("\n")
+
+    def close(self):
+        self.file.close()
+
+
+class XlsxReportWriter(object):
     """
+    Writes report rows to an Excel workbook, one row at a time.
+
+    The workbook is written in constant memory mode, so rows are flushed to disk
+    as they are written instead of being held until the workbook is closed.
+    """
+
+    def __init__(self, path, field_template):
+        import xlsxwriter
+
+        self.workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+        self.worksheet = self.workbook.add_worksheet()
+        self.field_template = field_template
+        self.worksheet.write_row(0, 0, field_template)
+        self.row_index = 1
+
+    def write_row(self, row):
+        self.worksheet.write_row(self.row_index, 0, [row.get(field) for field in self.field_template])
+        self.row_index += 1
+
+    def close(self):
+        self.workbook.close()
+
+
+# Report writer for each supported output file extension.
+REPORT_WRITERS = {
+    ".csv": CsvReportWriter,
+    ".jsonl": JsonlReportWriter,
+    ".xlsx": XlsxReportWriter,
+}
+
+
+def get_output_paths(args):
+    """
+
+    Args:
+        args: parser arguments
+
+    Returns: List of every report output path, the positional path followed by any given with --output.
+
+    """
+    return [args.path] + (args.output or [])
+
+
+def validate_output_paths(paths):
+    """
+    Checks the output paths can be handed to a report writer before any data is fetched from Shotgun.
+    Only the format and destination are checked, not whether the path is writable.
+
+    Args:
+        paths(list of str): Report output paths.
+
+    Returns: Raises ValueError if no paths are given, a path is given twice or a path has an unsupported extension.
+             Raises ImportError if xlsxwriter is needed but not installed.
+
+    """
+    if not paths:
+        raise ValueError("No report output path given.")
+
+    # Two writers on the same file would interleave or corrupt its output.
+    seen = set()
+    for path in paths:
+        abs_path = os.path.abspath(path)
+        if abs_path in seen:
+            raise ValueError("Report output path given more than once: {}".format(path))
+        seen.add(abs_path)
+
+        ext = os.path.splitext(path)[1].lower()
+        if ext not in REPORT_WRITERS:
+            raise ValueError(
+                "Unsupported report format for {}. Expected one of: {}".format(path, ", ".join(REPORT_WRITERS))
+            )
+        if REPORT_WRITERS[ext] is XlsxReportWriter:
+            import xlsxwriter  # noqa: F401
+
+
+def write_reports(paths, field_template, rows, logger):
+    """
+    Writes the given report rows to every given path in a single pass.
+    Each row is handed to every writer in turn, so rows can be a generator and are never all held in memory.
 
     Args:
-        path(str): Location to copy file to. Must include filename and extension.
-        field_template(list): List of column names for final csv data.
-        csv_dict(list of dict): List of formatted task dictionaries where keys match the field template key names.
+        paths(list of str): Report output paths. The extension decides the format, eg. .csv, .jsonl, .xlsx
+        field_template(list): List of column names for final report data.
+        rows(iterable of dict): Formatted task dictionaries where keys match the field template key names.
+        logger: python logging logger object
 
-    Returns: Writes a csv of the given data to the given location.
+    Returns: Number of rows written.
 
     """
-    with open(path, "w") as csv_file:
-        writer = csv.DictWriter(csv_file, lineterminator="\n", fieldnames=field_template)
-        writer.writeheader()
-        writer.writerows(csv_dict)
+    writers = []
+    row_count = 0
+    try:
+        for path in paths:
+            # Writers will error if the path doesn't exist.
+            dir_ = os.path.dirname(path)
+            if dir_ and not os.path.exists(dir_):
+                logger.debug("Creating directory: \n{}".format(dir_))
+                os.makedirs(dir_)
+
+            writer_class = REPORT_WRITERS[os.path.splitext(path)[1].lower()]
+            writers.append(writer_class(path, field_template))
+
+        for row in rows:
+            for writer in writers:
+                writer.write_row(row)
+            row_count += 1
+    finally:
+        for writer in writers:
+            writer.close()
+
+    return row_count
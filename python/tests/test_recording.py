@@ -0,0 +1,238 @@
+import gzip
+import logging
+
+import pytest
+
+from reports import asset_report
+from reports import recording
+from reports import replay_bench
+from reports import shot_report
+from reports import utils
+
+
+PROJECT = {"type": "Project", "id": 70, "name": "bigShow"}
+
+SHOT_TASKS = [
+    {
+        "type": "Task",
+        "id": 1001,
+        "content": "animationBlocking",
+        "step": {"type": "Step", "id": 5, "name": "Anim"},
+        "sg_status_list": "ip",
+        "start_date": "2021-02-25",
+        "due_date": "2021-03-05",
+        "entity": {"type": "Shot", "id": 300, "name": "sh010"},
+        "tags": [{"type": "Tag", "id": 9, "name": "hero"}],
+        "est_in_mins": 600,
+        "entity.Shot.sg_status_list": "ip",
+        "entity.Shot.code": "sh010",
+        "entity.Shot.sg_sequence.Sequence.sg_status_list": "ip",
+        "entity.Shot.sg_sequence.Sequence.code": "sq100",
+    },
+    {
+        "type": "Task",
+        "id": 1002,
+        "content": "lighting",
+        "step": {"type": "Step", "id": 6, "name": "Light"},
+        "sg_status_list": "wtg",
+        "start_date": None,
+        "due_date": None,
+        "entity": {"type": "Shot", "id": 301, "name": "sh020"},
+        "tags": [],
+        "est_in_mins": None,
+        "entity.Shot.sg_status_list": "hld",
+        "entity.Shot.code": "sh020",
+        "entity.Shot.sg_sequence.Sequence.sg_status_list": "ip",
+        "entity.Shot.sg_sequence.Sequence.code": "sq100",
+    },
+]
+
+ASSET_TASKS = [
+    {
+        "type": "Task",
+        "id": 2001,
+        "content": "surfaceRender",
+        "step": {"type": "Step", "id": 7, "name": "Surface"},
+        "sg_status_list": "ip",
+        "start_date": "2021-02-25",
+        "due_date": "2021-03-05",
+        "entity": {"type": "Asset", "id": 400, "name": "heroChar"},
+        "tags": [{"type": "Tag", "id": 9, "name": "hero"}],
+        "est_in_mins": 120,
+        "shots": [],
+        "entity.Asset.sg_status_list": "ip",
+        "entity.Asset.code": "heroChar",
+        "entity.Asset.sg_asset_type": "char",
+        "entity.Asset.shots": [{"type": "Shot", "id": 300, "name": "sh010"}],
+    },
+    {
+        "type": "Task",
+        "id": 2002,
+        "content": "model",
+        "step": {"type": "Step", "id": 8, "name": "Model"},
+        "sg_status_list": "ip",
+        "start_date": None,
+        "due_date": None,
+        "entity": {"type": "Asset", "id": 401, "name": "crate"},
+        "tags": [],
+        "est_in_mins": None,
+        "shots": [],
+        "entity.Asset.sg_status_list": "ip",
+        "entity.Asset.code": "crate",
+        "entity.Asset.sg_asset_type": "prop",
+        "entity.Asset.shots": [],
+    },
+]
+
+PROD_SHOTS = [
+    {
+        "type": "Shot",
+        "id": 300,
+        "code": "sh010",
+        "sg_status_list": "ip",
+        "sg_sequence.Sequence.sg_status_list": "ip",
+        "assets": [{"type": "Asset", "id": 400, "name": "heroChar"}],
+    },
+]
+
+
+class FakeShotgun(object):
+    """Answers the requests made by the shot and asset reports with canned data."""
+
+    def find_one(self, entity_type, filters, fields=None):
+        assert entity_type == "Project"
+        return dict(PROJECT)
+
+    def find(self, entity_type, filters, fields=None):
+        # The project filter must carry the real, un-anonymized project.
+        assert filters[0] == ["project", "is", PROJECT]
+        if entity_type == "Shot":
+            return PROD_SHOTS
+        if filters[1] == ["entity", "type_is", "Shot"]:
+            return SHOT_TASKS
+        return ASSET_TASKS
+
+
+def run_shot_flow(sg):
+    sg_project = utils.get_sg_project_from_id(sg, PROJECT["id"])
+    shot_tasks = shot_report.get_shot_tasks(sg, sg_project)
+    prod_shots = shot_report.get_production_shots_from_tasks(shot_tasks)
+    return sg_project, list(shot_report.iter_shot_report_rows(shot_tasks, prod_shots))
+
+
+def run_asset_flow(sg):
+    sg_project = utils.get_sg_project_from_id(sg, PROJECT["id"])
+    asset_tasks = asset_report.get_asset_tasks(sg, sg_project)
+    prod_shots = asset_report.get_production_shots(sg, sg_project)
+    prod_assets = asset_report.get_production_assets_from_shots(prod_shots, asset_tasks)
+    return sg_project, list(asset_report.iter_asset_report_rows(asset_tasks, prod_assets))
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = str(tmp_path / "traffic.jsonl.gz")
+    sg = recording.RecordingShotgun(FakeShotgun(), path, anonymize=True)
+
+    # Recording hands the real data back to the report.
+    sg_project, shot_rows = run_shot_flow(sg)
+    assert sg_project == PROJECT
+    assert [row["Shot Name"] for row in shot_rows] == ["sh010", "sh020"]
+    run_asset_flow(sg)
+    return path
+
+
+def test_archive_is_anonymized(archive):
+    with gzip.open(archive, "rt") as f:
+        content = f.read()
+
+    for name in ("bigShow", "sh010", "sq100", "heroChar", "crate", "Anim", "hero", "animationBlocking"):
+        assert name not in content
+
+
+def test_anonymizer_salt_is_random():
+    value = "sh010"
+    first = recording.Anonymizer().anonymize_value(value)
+    second = recording.Anonymizer().anonymize_value(value)
+    assert first != second
+    assert len(first) == len("anon_") + recording.Anonymizer.digest_length
+
+
+def test_replay_shot_flow(archive):
+    sg = recording.ReplayShotgun(archive, latency="zero")
+
+    # The Task filter holds the replayed project, which only matches because
+    # its name is anonymized in both the recorded key and response.
+    sg_project, rows = run_shot_flow(sg)
+    assert sg_project["id"] == PROJECT["id"]
+    assert sg_project["name"] != PROJECT["name"]
+
+    assert [row["ID"] for row in rows] == ["1001", "1002"]
+    assert [row["Production Shot"] for row in rows] == ["True", "False"]
+    assert rows[0]["Task Status"] == "ip"
+    assert rows[0]["Due Date"] == "2021-03-05"
+    assert rows[0]["Shot Name"] != "sh010"
+
+
+def test_replay_asset_flow(archive):
+    sg = recording.ReplayShotgun(archive, latency="zero")
+
+    sg_project, rows = run_asset_flow(sg)
+    assert [row["ID"] for row in rows] == ["2001", "2002"]
+    # Asset names linked from the production shot still match the anonymized task asset names.
+    assert [row["Production Asset"] for row in rows] == ["True", "False"]
+    assert [row["Asset Type"] for row in rows] == ["char", "prop"]
+
+
+def test_replay_unrecorded_request(archive):
+    sg = recording.ReplayShotgun(archive, latency="zero")
+
+    with pytest.raises(KeyError):
+        utils.get_sg_project_from_id(sg, 71)
+    with pytest.raises(KeyError):
+        shot_report.get_shot_tasks(sg, PROJECT)
+
+
+def test_anonymize_filters():
+    anonymizer = recording.Anonymizer()
+    filters = [
+        ["code", "is", "sh010"],
+        ["entity.Shot.code", "in", ["sh010", "sh020"]],
+        ["sg_status_list", "is", "ip"],
+        ["project", "is", PROJECT],
+        {"filter_operator": "any", "filters": [["content", "is", "lighting"]]},
+    ]
+
+    anon_filters = anonymizer.anonymize_filters(filters)
+    assert anon_filters == [
+        ["code", "is", anonymizer.anonymize_value("sh010")],
+        ["entity.Shot.code", "in", [anonymizer.anonymize_value("sh010"), anonymizer.anonymize_value("sh020")]],
+        ["sg_status_list", "is", "ip"],
+        ["project", "is", dict(PROJECT, name=anonymizer.anonymize_value("bigShow"))],
+        {"filter_operator": "any", "filters": [["content", "is", anonymizer.anonymize_value("lighting")]]},
+    ]
+
+
+@pytest.mark.parametrize("report", ["shot", "asset"])
+def test_replay_bench(archive, tmp_path, report):
+    paths = [str(tmp_path / "report.csv"), str(tmp_path / "report.jsonl")]
+    timings = replay_bench.bench(report, archive, PROJECT["id"], paths, 2, logging.getLogger(__name__))
+    assert sorted(timings) == ["filter", "write"]
+    assert all(duration >= 0 for duration in timings.values())
+
+
+def test_replay_bench_unknown_project(archive, tmp_path):
+    with pytest.raises(KeyError):
+        replay_bench.bench("shot", archive, 71, [str(tmp_path / "report.csv")], 1, logging.getLogger(__name__))
+
+
+def test_compare_to_baseline():
+    baseline = {"filter": 1.0, "write": 2.0}
+    assert replay_bench.compare_to_baseline({"filter": 1.05, "write": 2.0}, baseline, 0.1) == []
+    assert replay_bench.compare_to_baseline({"filter": 1.2, "write": 3.0}, baseline, 0.1) == ["filter", "write"]
+    # Stages missing from the baseline are not compared.
+    assert replay_bench.compare_to_baseline({"fetch": 9.0}, baseline, 0.1) == []
+
+
+def test_replay_unknown_latency(archive):
+    with pytest.raises(ValueError):
+        recording.ReplayShotgun(archive, latency="fast")
@@ -0,0 +1,43 @@
+import pytest
+
+from reports import sg_report
+from reports import utils
+
+
+@pytest.mark.parametrize("argv", [
+    ["shot", "r.csv", "123", "-o", "a.jsonl"],
+    ["shot", "r.csv", "-o", "a.jsonl", "123"],
+    ["asset", "r.csv", "-o", "a.jsonl", "123"],
+    ["shot", "r.csv", "--record", "x.gz", "-o", "a.jsonl", "123"],
+])
+def test_options_between_positionals(argv):
+    args = sg_report.get_parser().parse_args(argv)
+    assert args.project_id == 123
+    assert utils.get_output_paths(args) == ["r.csv", "a.jsonl"]
+
+
+def test_output_path_required():
+    with pytest.raises(SystemExit):
+        sg_report.get_parser().parse_args(["shot", "123"])
+
+
+@pytest.mark.parametrize("argv", [
+    ["shot", "r.csv", "123", "--anonymize"],
+    ["shot", "r.csv", "123", "--replay-latency", "zero"],
+    ["asset", "r.csv", "123", "--record", "x.gz", "--replay-latency", "zero"],
+])
+def test_connection_option_without_mode(argv):
+    parser = sg_report.get_parser()
+    args = parser.parse_args(argv)
+    with pytest.raises(SystemExit):
+        utils.check_connection_arguments(parser, args)
+
+
+@pytest.mark.parametrize("argv", [
+    ["shot", "r.csv", "123"],
+    ["shot", "r.csv", "123", "--record", "x.gz", "--anonymize"],
+    ["asset", "r.csv", "123", "--replay", "x.gz", "--replay-latency", "zero"],
+])
+def test_connection_option_with_mode(argv):
+    parser = sg_report.get_parser()
+    utils.check_connection_arguments(parser, parser.parse_args(argv))
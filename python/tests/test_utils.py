@@ -0,0 +1,94 @@
+import json
+import logging
+import re
+import sys
+import zipfile
+
+import pytest
+
+from reports import utils
+
+
+FIELDS = ("ID", "Task Name", "Due Date")
+
+ROWS = [
+    {"ID": "1", "Task Name": "animationBlocking", "Due Date": "2021-03-05"},
+    {"ID": "2", "Task Name": "lighting", "Due Date": None},
+]
+
+
+def test_write_reports_to_every_output(tmp_path):
+    csv_path = str(tmp_path / "out" / "report.csv")
+    jsonl_path = str(tmp_path / "report.jsonl")
+
+    # Rows are given as a generator, so they can only be read once.
+    row_count = utils.write_reports([csv_path, jsonl_path], FIELDS, iter(ROWS), logging.getLogger(__name__))
+    assert row_count == 2
+
+    with open(csv_path) as f:
+        assert f.read() == "ID,Task Name,Due Date\n1,animationBlocking,2021-03-05\n2,lighting,\n"
+    with open(jsonl_path) as f:
+        assert [json.loads(line) for line in f] == ROWS
+
+
+def read_xlsx_rows(path):
+    """Reads the first worksheet of the given workbook back as lists of cell strings."""
+    with zipfile.ZipFile(path) as workbook:
+        sheet = workbook.read("xl/worksheets/sheet1.xml").decode("utf-8")
+        shared = workbook.read("xl/sharedStrings.xml").decode("utf-8") if (
+            "xl/sharedStrings.xml" in workbook.namelist()
+        ) else ""
+
+    shared_strings = re.findall(r"<t[^>]*>(.*?)</t>", shared)
+    rows = []
+    for row in re.findall(r"<row[^>]*>(.*?)</row>", sheet):
+        cells = []
+        for attrs, cell in re.findall(r"<c([^>]*)>(.*?)</c>", row):
+            if 't="s"' in attrs:
+                cells.append(shared_strings[int(re.search(r"<v>(.*?)</v>", cell).group(1))])
+            else:
+                cells.append(re.search(r"<t[^>]*>(.*?)</t>", cell).group(1))
+        rows.append(cells)
+    return rows
+
+
+def test_write_reports_xlsx(tmp_path):
+    pytest.importorskip("xlsxwriter")
+    paths = [str(tmp_path / "report.csv"), str(tmp_path / "report.jsonl"), str(tmp_path / "report.xlsx")]
+    utils.validate_output_paths(paths)
+
+    row_count = utils.write_reports(paths, FIELDS, (row for row in ROWS), logging.getLogger(__name__))
+    assert row_count == 2
+
+    with open(paths[0]) as f:
+        assert f.read() == "ID,Task Name,Due Date\n1,animationBlocking,2021-03-05\n2,lighting,\n"
+    with open(paths[1]) as f:
+        assert [json.loads(line) for line in f] == ROWS
+    # Empty cells are not written to the workbook.
+    assert read_xlsx_rows(paths[2]) == [
+        list(FIELDS),
+        ["1", "animationBlocking", "2021-03-05"],
+        ["2", "lighting"],
+    ]
+
+
+def test_validate_output_paths_xlsx_without_xlsxwriter(monkeypatch):
+    monkeypatch.setitem(sys.modules, "xlsxwriter", None)
+    with pytest.raises(ImportError):
+        utils.validate_output_paths(["r.xlsx"])
+
+
+def test_validate_output_paths_unsupported_format():
+    with pytest.raises(ValueError):
+        utils.validate_output_paths(["report.txt"])
+
+
+def test_validate_output_paths_no_paths():
+    with pytest.raises(ValueError):
+        utils.validate_output_paths([])
+
+
+def test_validate_output_paths_duplicates(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ValueError):
+        utils.validate_output_paths(["report.csv", str(tmp_path / "report.csv")])